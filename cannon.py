@@ -277,7 +277,10 @@ class Game:
                 self.window.flags,
                 )
         # Temporary drawing surface -- draw on this, blit the drawn portion, than clear this.
-        self.surfs['surf_draw'] = pygame.Surface(self.surfs['surf_game_art'].get_size(), flags=pygame.SRCALPHA)
+        ### convert_alpha() -> Surface (display pixel format, with per-pixel alpha): blits skip the format conversion
+        self.surfs['surf_draw'] = pygame.Surface(self.surfs['surf_game_art'].get_size(), flags=pygame.SRCALPHA).convert_alpha()
+        # Graph paper artwork -- GraphPaper.render() keeps a copy of the graph paper here.
+        self.surfs['surf_graph_paper'] = pygame.Surface(self.surfs['surf_game_art'].get_size(), flags=0).convert()
 
         # Game data
         self.mouse = Mouse(self)
@@ -287,6 +290,9 @@ class Game:
         self.define_initial_state()
 
 
+        # Debug HUD (make it once, clear its text every frame)
+        self.debugHud = DebugHud(self)
+
         # FPS
         self.clock = pygame.time.Clock()
 
@@ -479,7 +485,8 @@ class Game:
                 case pygame.WINDOWRESIZED:
                     self.window.handle_WINDOWRESIZED(event)
                     self.surfs['surf_game_art'] = pygame.Surface(self.window.size, flags=0)
-                    self.surfs['surf_draw'] = pygame.Surface(self.surfs['surf_game_art'].get_size(), flags=pygame.SRCALPHA)
+                    self.surfs['surf_draw'] = pygame.Surface(self.surfs['surf_game_art'].get_size(), flags=pygame.SRCALPHA).convert_alpha()
+                    self.surfs['surf_graph_paper'] = pygame.Surface(self.surfs['surf_game_art'].get_size(), flags=0).convert()
                 case pygame.QUIT: sys.exit()
                 case pygame.KEYDOWN: self.handle_keydown(event)
                 case pygame.KEYUP: pass
@@ -640,8 +647,8 @@ class Game:
         self.render_dot(started_line.start, radius=small_radius, color=Color(255,0,0,150))
 
     def game_loop(self) -> None:
-        # Create the debug HUD (create this first so everything after can add debug text)
-        self.debugHud = DebugHud(self)
+        # Clear the debug HUD (do this first so everything after can add debug text)
+        self.debugHud.clear_text()
         self.debugHud.is_visible = self.settings['setting_show_debugHud']
         if self.settings['setting_gravity_on']:
             self.debugHud.add_text("GRAVITY: ON")
@@ -11,8 +11,8 @@
 [x] Add dark and light color schemes
     * Define 'colors' dict with suffix '_dark' for dark mode and '_light' for light mode
     * API:
-        * Game has 'property' methods for each color WITHOUT the '_dark'/'_light' suffix
-        * Reading a 'game.color_blah' does the check for dark mode and returns the appropriate color
+        * Game has attributes for each color WITHOUT the '_dark'/'_light' suffix
+        * Toggling dark mode rebuilds these attributes, so reading 'game.color_blah' returns the appropriate color
 [x] Draw grid
 [x] Center grid on screen
     * 'r' resets the xfm matrix and recenters the grid
@@ -87,40 +87,54 @@
 """
 
 import math
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass
+from typing import NamedTuple
 import sys
 import atexit
 import logging
 import os
+import numpy as np
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"          # Set pygame env var to hide "Hello" msg
 import pygame
 from pygame import Color, Rect
-from libs.utils import setup_logging
+from libs.utils import setup_logging, render_text, signum
 
 def shutdown() -> None:
     if logger: logger.info("Shutdown")
     # Clean up GUI
-    pygame.font.quit()                                  # Uninitialize the font module
+    if pygame.font.get_init(): pygame.font.quit()       # Uninitialize the font module
     pygame.quit()                                       # Uninitialize all pygame modules
 
-def signum(num) -> int:
-    """Return sign of num as +1, -1, or 0.
+@lru_cache(maxsize=None)
+def match_font(sys_font:str) -> str:
+    """Return the path to the font file of this system font (None if not found).
 
-    >>> signum(5)
-    1
-    >>> signum(-5)
-    -1
-    >>> signum(0)
-    0
-    >>> signum(0.1)
-    1
-    >>> signum(-0.1)
-    -1
+    Same as 'pygame.font.match_font(sys_font)', but memoized: it searches the
+    system fonts every call. 'SysFont()' does that search too. Instead, open
+    the file directly: 'pygame.font.Font(match_font(sys_font), size)'.
+    """
+    return pygame.font.match_font(sys_font)
+
+@lru_cache(maxsize=None)
+def load_font(sys_font:str, size:int) -> pygame.font.Font:
+    """Return this system font at this size. Load it on first use, then reuse it.
+
+    'pygame.init()' initializes the font module. Fonts are only valid until
+    'pygame.font.quit()' (see 'shutdown()').
     """
-    if num > 0: return 1
-    elif num < 0: return -1
-    else: return 0
+    ### Font(file_path=None, size=12) -> Font (file_path=None: the default font)
+    return pygame.font.Font(match_font(sys_font), size)
+
+@lru_cache(maxsize=4096)
+def measure_text(font:pygame.font.Font, text:str) -> tuple:
+    """Return (w,h) size of text rendered in this font.
+
+    Same as 'font.size(text)', but memoized: vector component labels are
+    small integers, so the same few strings get measured every frame.
+    """
+    return font.size(text)
 
 class Text:
     def __init__(self, pos:tuple, font_size:int, sys_font:str):
@@ -129,9 +143,7 @@ class Text:
         self.sys_font = sys_font
         self.antialias = True
 
-        if not pygame.font.get_init(): pygame.font.init()
-
-        self.font = pygame.font.SysFont(self.sys_font, self.font_size)
+        self.font = load_font(self.sys_font, self.font_size)
 
         self.text_lines = []
 
@@ -141,20 +153,29 @@ class Text:
 
     def render(self, surf:pygame.Surface, color:Color) -> None:
         """Render text on the surface."""
-        for i, line in enumerate(self.text_lines):
-            ### render(text, antialias, color, background=None) -> Surface
-            text_surf = self.font.render(line, self.antialias, color)
-            surf.blit(text_surf,
-                      (self.pos[0], self.pos[1] + i*self.font.get_linesize()),
-                      special_flags=pygame.BLEND_ALPHA_SDL2
-                      )
+        color = tuple(color)
+        x, y = self.pos
+        linesize = self.font.get_linesize()
+        # Blit all lines in one call
+        ### blits(blit_sequence=((source, dest, area, special_flags), ...), doreturn=1) -> [Rect, ...] or None
+        surf.blits([(render_text(self.font, line, self.antialias, color),
+                     (x, y + i*linesize),
+                     None,
+                     pygame.BLEND_ALPHA_SDL2)
+                    for i, line in enumerate(self.text_lines)],
+                   doreturn=False)
 
 class DebugHud:
     def __init__(self, game):
+        """Debug text overlay. Make one and reuse it: call clear_text() at the start of each frame."""
         self.game = game
         self.debug_text = ""
         self.text = Text((0,0), font_size=15, sys_font="Roboto Mono")
 
+    def clear_text(self) -> None:
+        """Remove the debug text added last frame."""
+        self.debug_text = ""
+
     def add_text(self, debug_text:str):
         """Add another line of debug text.
 
@@ -167,7 +188,7 @@ class DebugHud:
 
     def render(self) -> None:
         color = self.game.color_debug_hud
-        mpos = pygame.mouse.get_pos()
+        mpos = self.game._mpos
         self.text.update(f"FPS: {self.game.clock.get_fps():0.1f} | Window: {self.game.os_window.size} | Mouse: {mpos}"
                          f"{self.debug_text}")
         self.text.render(self.game.surfs['surf_os_window'], color)
@@ -200,11 +221,19 @@ class OsWindow:
     def __init__(self, size:tuple, is_fullscreen:bool=False):
         # Set initial sizes for windowed and fullscreen
         self._windowed_size = size
-        self._fullscreen_size = pygame.display.get_desktop_sizes()[-1]
+        self._refresh_desktop_sizes() # Set desktop_sizes and _fullscreen_size
 
         # Set initial state: windowed or fullscreen
         self._is_fullscreen = is_fullscreen
 
+        # Set by 'define_surfaces()': True if display.flip() waits for vsync
+        self.is_vsync = False
+
+        # The set_mode flags are fixed for each state: combine them once here
+        self._flags_windowed = pygame.RESIZABLE
+        self._flags_fullscreen = pygame.FULLSCREEN
+        self._flags_vsync = pygame.FULLSCREEN | pygame.SCALED # Fullscreen with vsync needs SCALED
+
         # Update window size and flags to match state of is_fullscreen
         # (size will set to windowed or fullscreen size depending on is_fullscreen)
         # (flags will set to RESIZABLE or FULLSCREEN depending on is_fullscreen)
@@ -222,19 +251,24 @@ class OsWindow:
     def flags(self) -> tuple:
         return self._flags
 
+    @property
+    def flags_vsync(self) -> int:
+        return self._flags_vsync
+
     def _set_size_and_flags(self) -> None:
         """Set _size and _flags."""
         if self.is_fullscreen:
-            # Update w x h of fullscreen (in case external display changed while game is running).
-            # Always use last display listed (if I have an external display, it will list last).
-            self._fullscreen_size = pygame.display.get_desktop_sizes()[-1]
+            # Use the cached w x h of fullscreen (querying the desktop sizes is a round-trip
+            # to the window system). 'toggle_fullscreen()' refreshes it on the way in.
             self._size = self._fullscreen_size
-            self._flags = pygame.FULLSCREEN
+            self._flags = self._flags_fullscreen
         else:
             self._size = self._windowed_size
-            self._flags = pygame.RESIZABLE
+            self._flags = self._flags_windowed
         # Report new window size
-        logger.debug(f"Window size: {self.size[0]} x {self.size[1]}")
+        # Guard debug logs on the resize path: skip building the message if DEBUG is off
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Window size: %d x %d", self.size[0], self.size[1])
 
 
     def toggle_fullscreen(self) -> None:
@@ -254,15 +288,33 @@ class OsWindow:
         logger.debug(f"Fullscreen size: {desktop_sizes[-1]}")
         """
         self._is_fullscreen = not self.is_fullscreen
-        logger.debug(f"FULLSCREEN: {self.is_fullscreen}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("FULLSCREEN: %s", self.is_fullscreen)
+        # Update w x h of fullscreen (in case external display changed while game is running).
+        # Only when entering fullscreen: leaving it uses the windowed size.
+        if self.is_fullscreen: self._refresh_desktop_sizes()
         self._set_size_and_flags() # Set size and flags based on fullscreen or windowed
 
     def handle_WINDOWRESIZED(self, event) -> None:
         """Track size of resized OS window in self._windowed_size"""
-        logger.debug(f"Window resized")
+        logger.debug("Window resized")
         self._windowed_size = (event.x, event.y)
         self._set_size_and_flags()
 
+    def handle_WINDOWDISPLAYCHANGED(self, event) -> None:
+        """Update w x h of fullscreen (the window moved to another display)."""
+        self._refresh_desktop_sizes()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Display changed. Fullscreen size: %d x %d", *self._fullscreen_size)
+
+    def _refresh_desktop_sizes(self) -> None:
+        """Query the sizes of the connected displays and cache them in desktop_sizes.
+
+        Always use last display listed for fullscreen (if I have an external display, it will list last).
+        """
+        self.desktop_sizes = pygame.display.get_desktop_sizes()
+        self._fullscreen_size = self.desktop_sizes[-1]
+
 def define_settings() -> dict:
     settings = {}
     settings['setting_debug'] = True
@@ -270,10 +322,77 @@ def define_settings() -> dict:
     settings['setting_gravity_on'] = True
     return settings
 
-def define_surfaces(os_window:OsWindow) -> dict:
+def max_surface_size(size:tuple, desktop_sizes:list) -> tuple:
+    """Return (w,h) big enough for 'size' and for a fullscreen window on any display.
+
+    :param desktop_sizes:list -- cached display sizes, see 'OsWindow.desktop_sizes'
+    """
+    w, h = size
+    for desktop_w, desktop_h in desktop_sizes:
+        w, h = max(w, desktop_w), max(h, desktop_h)
+    return (w, h)
+
+class SurfacePool:
+    """Hand out Surfaces by name and size. Reuse memory instead of allocating it again.
+
+    :param os_window:OsWindow -- a Surface grows no bigger than its largest display
+    :param growth:float -- when a Surface is too small, grow it by this factor
+
+    Keep one Surface per name at its high-water mark size. Hand out a
+    subsurface of it: a view of its top-left (w,h). Only allocate again when
+    the requested size does not fit, and then leave room to grow, so dragging
+    the window edge does not allocate on every resize.
+
+    Ask for an 'exact' Surface to skip the view: 'pygame.draw.aaline()' blends
+    with the wrong pixels on a subsurface narrower than its parent.
+    """
+    def __init__(self, os_window:OsWindow, growth:float=1.5):
+        self.os_window = os_window
+        self.growth = growth
+        self._surfs = {}                                # Dict of Surfaces: {name: Surface at high-water mark size}
+
+    def get(self, name:str, size:tuple, alpha:bool=True, exact:bool=False) -> pygame.Surface:
+        """Return a cleared Surface for this name and size.
+
+        :param name:str -- Surface name, e.g., 'surf_game_art'
+        :param size:tuple -- (w,h)
+        :param alpha:bool -- True: per-pixel alpha. False: opaque.
+        :param exact:bool -- True: return a Surface of exactly this size, not a view.
+
+        Surfaces are converted to the display's pixel format, so blits skip the
+        per-pixel format conversion. Call this after 'pygame.display.set_mode()'.
+        """
+        w, h = size
+        surf = self._surfs.get(name)
+        if exact:
+            if (surf is None) or (surf.get_size() != size):
+                if alpha: surf = pygame.Surface(size, flags=pygame.SRCALPHA).convert_alpha()
+                else: surf = pygame.Surface(size).convert()
+                self._surfs[name] = surf
+            else:
+                surf.fill((0,0,0,0))
+            return surf
+        if (surf is None) or (w > surf.get_width()) or (h > surf.get_height()):
+            if surf is not None:
+                # Grow (but no bigger than the largest display, unless the window is bigger)
+                max_w, max_h = max_surface_size(size, self.os_window.desktop_sizes)
+                w = min(max(w, int(surf.get_width()*self.growth)), max_w)
+                h = min(max(h, int(surf.get_height()*self.growth)), max_h)
+            ### convert() -> Surface (same pixel format as the display)
+            ### convert_alpha() -> Surface (display pixel format, with per-pixel alpha)
+            if alpha: surf = pygame.Surface((w,h), flags=pygame.SRCALPHA).convert_alpha()
+            else: surf = pygame.Surface((w,h)).convert()
+            self._surfs[name] = surf
+        ### subsurface(Rect) -> Surface (shares pixels with its parent)
+        view = surf.subsurface((0,0), size)
+        view.fill((0,0,0,0))
+        return view
+
+def define_surfaces(os_window:OsWindow, surf_pool:SurfacePool) -> dict:
     """Return dictionary of pygame Surfaces.
 
     :param os_window:OsWindow -- defines OS Window 'size' and 'flags'
+    :param surf_pool:SurfacePool -- reuse memory from earlier Surfaces
     :return dict -- {'surf_name': pygame.Surface, ...}
 
     Call this to create the initial window.
@@ -286,14 +405,33 @@ def define_surfaces(os_window:OsWindow) -> dict:
 
     # The first surface is the OS Window. Initialize the window for display.
     ### set_mode(size=(0, 0), flags=0, depth=0, display=0, vsync=0) -> Surface
-    surfs['surf_os_window'] = pygame.display.set_mode(os_window.size, os_window.flags)
+    # In fullscreen, ask for vsync: display.flip() then sleeps until the monitor
+    # refresh, so the game loop does not need clock.tick() to cap the framerate.
+    # Vsync needs the SCALED renderer. Only use it in fullscreen: the size is fixed
+    # there, but a RESIZABLE+SCALED window stretches the art instead of resizing it.
+    os_window.is_vsync = False
+    if os_window.is_fullscreen:
+        try:
+            surfs['surf_os_window'] = pygame.display.set_mode(
+                    os_window.size, os_window.flags_vsync, vsync=1)
+            os_window.is_vsync = True
+        except pygame.error as e:
+            # No renderer for vsync (e.g., software video driver)
+            logger.debug(f"No vsync: {e}")
+    if not os_window.is_vsync:
+        surfs['surf_os_window'] = pygame.display.set_mode(os_window.size, os_window.flags)
 
     # Blend artwork on the game art surface.
     # This is the final surface that is  copied to the OS Window.
-    surfs['surf_game_art'] = pygame.Surface(os_window.size, flags=pygame.SRCALPHA)
+    # It is opaque (filled with the background color every frame), so it has no
+    # per-pixel alpha: copying it to the OS Window is a plain copy, not a blend.
+    surfs['surf_game_art'] = surf_pool.get('surf_game_art', os_window.size, alpha=False)
+
+    # Game history artwork -- only redrawn when the game history or the view changes.
+    surfs['surf_history'] = surf_pool.get('surf_history', os_window.size)
 
-    # Temporary drawing surface -- draw on this, blit the drawn portion, then clear this.
-    surfs['surf_draw'] = pygame.Surface(surfs['surf_game_art'].get_size(), flags=pygame.SRCALPHA)
+    # Graph paper artwork ('surf_grid_dark' and 'surf_grid_light') is only
+    # allocated for the color scheme on screen: see 'Grid.draw()'.
 
     return surfs
 
@@ -333,8 +471,12 @@ def define_colors() -> dict:
     colors['color_hit_light'] = Color(255,0,0)
     return colors
 
-@dataclass
-class LineSeg:
+class LineSeg(NamedTuple):
+    """Line segment from 'start' to 'end'.
+
+    A NamedTuple (not a dataclass): cheap to make, and immutable. To change
+    it, make a new one.
+    """
     start:tuple
     end:tuple
 
@@ -371,6 +513,7 @@ class Grid:
         self.game = game
         self.N = N
         self.scale = 1.0 # zoom
+        self._cache_keys = {} # {'surf_grid_dark' or 'surf_grid_light': (bgnd color, line color, size) of its graph paper}
         self.reset()
 
     def reset(self) -> None:
@@ -397,6 +540,7 @@ class Grid:
         self.is_panning = False # Tracks whether mouse is panning
 
         self.scale = self.zoom_to_fit()
+        self.update_coeffs()
 
     def zoom_to_fit(self) -> float:
         # Get the size of the grid
@@ -420,6 +564,28 @@ class Grid:
     def scaled(self) -> tuple:
         return (self.a*self.scale, self.b*self.scale, self.c*self.scale, self.d*self.scale)
 
+    def update_coeffs(self) -> None:
+        """Precompute the scaled 2x3 transformation matrix [a,b,e;c,d,f] as 'self.coeffs'.
+
+        Call this whenever the transform changes (reset, zoom, pan). Hot
+        loops destructure 'self.coeffs' once instead of calling 'xfm_gp' per
+        point:
+
+            a,b,c,d,e,f = self.grid.coeffs
+            x_p = a*x_g + b*y_g + e
+            y_p = c*x_g + d*y_g + f
+
+        Also precompute the inverse transform as 'self.inv_coeffs' for 'xfm_pg'.
+        """
+        a,b,c,d = self.scaled()
+        e,f = (self.e, self.f)
+        self.coeffs = (a, b, c, d, e, f)
+        # Inverse transform: pixel coordinates to game grid coordinates
+        det = self.det
+        self.inv_coeffs = (   d/det, -1*b/det, (b*f-d*e)/det,
+                           -1*c/det,    a/det, (c*e-a*f)/det)
+        self._lines_dirty = True # Grid line endpoints need to be transformed again
+
     @property
     def det(self) -> float:
         a,b,c,d = self.scaled()
@@ -428,16 +594,24 @@ class Grid:
             # If det=0, Ainv will have div by 0, so just make det very small.
             return 0.0001
         else:
-            return a*d-b*c
+            return det
 
     def xfm_gp(self, point:tuple) -> tuple:
         """Transform point from game grid coordinates to OS Window pixel coordinates."""
-        # Define 2x2 transform
-        a,b,c,d = self.scaled()
-        # Define offset vector (in pixel coordinates)
-        e,f = (self.e, self.f)
+        # Define 2x2 transform and offset vector (in pixel coordinates)
+        a,b,c,d,e,f = self.coeffs
         return (a*point[0] + b*point[1] + e, c*point[0] + d*point[1] + f)
 
+    def xfm_gp_batch(self, points:np.ndarray) -> np.ndarray:
+        """Transform many points from game grid coordinates to OS Window pixel coordinates.
+
+        :param points:np.ndarray -- (N,2) array of (x,y) in grid coordinates
+        :return np.ndarray -- (N,2) array of (x,y) in pixel coordinates
+        """
+        # Define 2x2 transform and offset vector (in pixel coordinates)
+        a,b,c,d,e,f = self.coeffs
+        return points @ np.array([[a,c],[b,d]]) + np.array([e,f])
+
     def xfm_pg(self, point:tuple, p:int=0) -> tuple:
         """Transform point from OS Window pixel coordinates to game grid coordinates.
 
@@ -445,67 +619,119 @@ class Grid:
         :param p:int -- decimal precision of returned coordinate (default: 0, return ints)
         :return tuple -- (x,y) in grid goordinates
         """
-        # Define 2x2 transform
-        a,b,c,d = self.scaled()
-        # Define offset vector (in pixel coordinates)
-        e,f = (self.e, self.f)
-        # Calculate the determinant of the 2x2
-        det = self.det
-        g = ((   d/det)*point[0] + (-1*b/det)*point[1] + (b*f-d*e)/det,
-             (-1*c/det)*point[0] + (   a/det)*point[1] + (c*e-a*f)/det)
+        a,b,c,d,e,f = self.coeffs
+        if b == 0 and c == 0:
+            # Grid is axis-aligned: invert each axis on its own.
+            # Exact halves stay exact, so this snaps like 'Game.snap_to_grid()'.
+            g = ((point[0] - e)/a, (point[1] - f)/d)
+        else:
+            # Inverse of the 2x3 transform (see 'update_coeffs()')
+            ia,ib,ie,ic,id_,if_ = self.inv_coeffs
+            g = (ia*point[0] + ib*point[1] + ie,
+                 ic*point[0] + id_*point[1] + if_)
         # Define precision
         if p==0:
-            return (int(round(g[0])), int(round(g[1])))
+            # Snap to the nearest int, halves round up (not to even like 'round()')
+            floor = math.floor
+            return (floor(g[0] + 0.5), floor(g[1] + 0.5))
         else:
             return (round(g[0],p), round(g[1],p))
 
     def zoom_in(self) -> None:
         self.scale *= 1.1
+        self.update_coeffs()
 
     def zoom_out(self) -> None:
         self.scale *= 0.9
+        self.update_coeffs()
 
     def pan(self, mpos:tuple) -> None:
         self.e = self.pan_origin[0] + (mpos[0] - self.pan_ref[0])
         self.f = self.pan_origin[1] + (mpos[1] - self.pan_ref[1])
+        self.update_coeffs()
 
-    @property
-    def hlinesegs(self) -> list:
-        """Return list of horizontal line segments."""
-        ### Put origin in center
-        a = -1*int(self.N/2)
-        b = int(self.N/2)
-        cs = list(range(a,b+1))
-        hls = []
-        for c in cs:
-            hls.append(LineSeg(start=(a,c), end=(b,c)))
-        return hls
+    def _rebuild_cache(self) -> None:
+        """Transform the grid line endpoints to pixel coordinates in one batch.
 
-    @property
-    def vlinesegs(self) -> list:
+        Store them in 'self._line_endpoints_p': list of ((x0,y0),(x1,y1)) in pixel coordinates.
+        Horizontal lines first, then vertical lines.
+
+        If the grid is axis-aligned, also store each line as a 1-pixel-wide
+        Rect in 'self._line_rects' (else None): see '_render_cache()'.
+        """
         ### Put origin in center
         a = -1*int(self.N/2)
         b = int(self.N/2)
-        cs = list(range(a,b+1))
-        vls = []
-        for c in cs:
-            vls.append(LineSeg(start=(c,a), end=(c,b)))
-        return vls
+        cs = np.arange(a,b+1)
+        lo = np.full(len(cs), a)
+        hi = np.full(len(cs), b)
+        # Endpoints in game coordinates: rows of (x0,y0,x1,y1)
+        hlines = np.column_stack([lo, cs, hi, cs])
+        vlines = np.column_stack([cs, lo, cs, hi])
+        endpoints_g = np.concatenate([hlines, vlines])
+        endpoints_p = self.xfm_gp_batch(endpoints_g.reshape(-1,2)).reshape(-1,2,2)
+        self._line_endpoints_p = [(tuple(start), tuple(end)) for start, end in endpoints_p.tolist()]
+        if self.b == 0 and self.c == 0:
+            # Snap the endpoints to the nearest pixel, then make each line a
+            # stripe from its min to its max pixel (inclusive, like 'aaline()')
+            ends = np.floor(endpoints_p + 0.5).astype(int)
+            mins = ends.min(axis=1)                     # (x,y) min of each line
+            sizes = ends.max(axis=1) - mins + 1         # (w,h) of each line
+            self._line_rects = [Rect(x, y, w, h) for (x, y), (w, h) in zip(mins.tolist(), sizes.tolist())]
+        else:
+            self._line_rects = None
+        self._lines_dirty = False
 
     def draw(self, surf:pygame.Surface) -> None:
+        """Draw the graph paper (background and grid lines) on the surface.
+
+        The graph paper only changes with the transform, the colors, or the
+        surface size. Render it once and blit that every frame. Keep one
+        render per color scheme ('surf_grid_dark' and 'surf_grid_light'), so
+        toggling dark mode back and forth just blits the other one.
+
+        Only get the surface for a color scheme when it is rendered, so the
+        scheme that is not shown is never allocated. An axis-aligned grid is
+        filled, so a view from the 'SurfacePool' works. Other grids are drawn
+        with 'aaline()', which needs an 'exact' Surface (see 'SurfacePool').
+        """
+        if self._lines_dirty:
+            # Only recompute the line endpoints when the transform changed (see 'update_coeffs()')
+            self._rebuild_cache()
+            self._cache_keys = {}                       # Both color schemes are stale
+        name = 'surf_grid_dark' if self.game.settings['setting_dark_mode'] else 'surf_grid_light'
+        bgnd = self.game.color_graph_paper_bgnd
         color = self.game.color_graph_paper_lines
-        linesegs = self.hlinesegs + self.vlinesegs
-        for grid_line in linesegs:
+        cache_key = (tuple(bgnd), tuple(color), surf.get_size())
+        surfs = self.game.surfs
+        if (cache_key != self._cache_keys.get(name)) or (name not in surfs):
+            surfs[name] = self.game.surf_pool.get(name, surf.get_size(), alpha=False,
+                                                  exact=(self._line_rects is None))
+            self._render_cache(surfs[name], bgnd, color)
+            self._cache_keys[name] = cache_key
+        ### pygame.Surface.blit(source, dest, area=None, special_flags=0) -> Rect
+        surf.blit(surfs[name], (0,0))
+
+    def _render_cache(self, surf:pygame.Surface, bgnd:Color, color:Color) -> None:
+        """Render the graph paper on the surface: background color, then grid lines."""
+        surf.fill(bgnd)
+        if self._line_rects is not None:
+            # Axis-aligned grid: fill a 1-pixel stripe per line (a memset per
+            # row) instead of rasterizing the line with 'aaline()'
+            fill = surf.fill
+            for rect in self._line_rects: fill(color, rect)
+            return
+        # The grid lines are disjoint, so they are not one polyline for 'aalines()':
+        # joining them would draw the joins twice along the border lines.
+        # Bind 'aaline' once instead of looking it up for every line.
+        aaline = pygame.draw.aaline
+        for start, end in self._line_endpoints_p:
             ### Anti-aliased:
             ### aaline(surface, color, start_pos, end_pos, blend=1) -> Rect
             ### Blend is 0 or 1. Both are anti-aliased.
             ### 1: (this is what you want) blend with the surface's existing pixel color
             ### 0: completely overwrite the pixel (as if blending with black)
-            pygame.draw.aaline(surf, color, 
-                    self.xfm_gp(grid_line.start),
-                    self.xfm_gp(grid_line.end),
-                    blend=1                             # 0 or 1
-                    )
+            aaline(surf, color, start, end, 1)
 
     @property
     def size(self) -> tuple:
@@ -531,20 +757,25 @@ class GameHistory:
     """All the line segments drawn and force vectors applied so far.
 
     head:int -- a "play head" that points at a specific iteration in the game history
-    size:int -- length of all lists in the history (all lists are always the same size)
+    size:int -- number of iterations in the history
+    data:np.ndarray -- one row per iteration: 'line_seg', 'force_vector', and 'final_seg'
     line_segs:list -- all line segments in the game history
-    colors:list -- color of each line segment in the game history
     force_vectors:list -- all force vectors in the game history
+    final_segs:list -- all final segments in the game history
     undo() -- move "head" backward in game history
     redo() -- move "head" forward in game history
 
+    The history is a preallocated NumPy structured array. Recording an
+    iteration writes the next row; only 'data[:size]' is valid. When the
+    array is full, its capacity doubles.
+
     Start an empty Game History
     >>> gameHistory = GameHistory()
     >>> print(gameHistory.head)
     None
 
     Record three iterations of history
-    >>> physics = Physics(LineSeg((1,2),(3,5)))
+    >>> physics = Physics(LineSeg((1,2),(3,5)), (0,-1), LineSeg((1,2),(3,4)))
     >>> gameHistory.record(physics)
     >>> print(gameHistory.head)
     0
@@ -583,11 +814,12 @@ class GameHistory:
     >>> print(gameHistory.head)
     2
     """
-    def __init__(self):
-        self.line_segs = []                             # Initialize: empty list of line segments
-        self.line_colors = []                           # Initialize: empty list of line colors
-        self.force_vectors = []                         # Initialize: empty list of force vectors
-        self.final_segs = []                           # Initialize: empty list of sum vectors
+    dtype = np.dtype([('line_seg', 'i4', (2,2)),        # (start, end) of the initial vector
+                      ('force_vector', 'i4', (2,)),     # force applied on this step
+                      ('final_seg', 'i4', (2,2))])      # (start, end) of the final vector
+
+    def __init__(self, capacity:int=256):
+        self.data = np.zeros(capacity, dtype=self.dtype) # Initialize: preallocated, empty history
         self.head = None                                # Initialize: head points at nothing
         self.size = 0                                   # Initialize: history size is 0
 
@@ -595,24 +827,48 @@ class GameHistory:
         if (self.head == None):
             # Prune the future before appending
             self.size = 0
-            self.line_segs = []
-            self.line_colors = []
-            self.force_vectors = []
-            self.final_segs = []
         elif (self.head < self.size-1):
             # Prune the future before appending
             self.size = self.head+1
-            self.line_segs = self.line_segs[0:self.size]
-            self.line_colors = self.line_colors[0:self.size]
-            self.force_vectors = self.force_vectors[0:self.size]
-            self.final_segs = self.final_segs[0:self.size]
-        # Normal append
-        self.line_segs.append(physics.line_seg)         # Add this line segment to the history
-        self.force_vectors.append(physics.force_vector) # Add this force vector to the history
-        self.final_segs.append(physics.final_seg)       # Add the final vector to the history
+        if self.size == len(self.data):
+            # History is full: double the capacity
+            data = np.zeros(2*len(self.data), dtype=self.dtype)
+            data[:self.size] = self.data
+            self.data = data
+        # Normal append: write the next row
+        i = self.size
+        self.data['line_seg'][i] = (physics.line_seg.start, physics.line_seg.end)
+        self.data['force_vector'][i] = physics.force_vector
+        self.data['final_seg'][i] = (physics.final_seg.start, physics.final_seg.end)
         self.size += 1                                  # History size increases by 1
         self.move_head_forward()
 
+    def line_seg(self, i:int) -> LineSeg:
+        """Return the line segment at iteration i."""
+        start, end = self.data['line_seg'][i].tolist()
+        return LineSeg(tuple(start), tuple(end))
+
+    def force_vector(self, i:int) -> tuple:
+        """Return the force vector at iteration i."""
+        return tuple(self.data['force_vector'][i].tolist())
+
+    def final_seg(self, i:int) -> LineSeg:
+        """Return the final segment at iteration i."""
+        start, end = self.data['final_seg'][i].tolist()
+        return LineSeg(tuple(start), tuple(end))
+
+    @property
+    def line_segs(self) -> list:
+        return [self.line_seg(i) for i in range(self.size)]
+
+    @property
+    def force_vectors(self) -> list:
+        return [self.force_vector(i) for i in range(self.size)]
+
+    @property
+    def final_segs(self) -> list:
+        return [self.final_seg(i) for i in range(self.size)]
+
     def move_head_forward(self) -> None:
         if self.head == None:
             self.head = 0                               # Point head at first element
@@ -636,7 +892,8 @@ class Player:
     :param n:int -- Player number (Player 1, Player 2, etc.)
 
     Attributes
-    :attr color:pygame.Color -- color of the player's satellite and vectors
+    :attr color_line:pygame.Color -- color of the player's satellite and vectors
+    :attr color_final:pygame.Color -- color of the player's final vectors
     :attr pos:tuple -- satellite (x,y) grid coordinate
     :attr state:str -- track player's game state
     :attr game_history:GameHistory -- track velocity vectors for this player
@@ -644,6 +901,7 @@ class Player:
     def __init__(self, game, n:int):
         self.game = game
         self.n = n
+        self.rebuild_palette()
         self.reset()
 
     def reset(self) -> None:
@@ -655,7 +913,7 @@ class Player:
     def update(self) -> None:
         match self.state:
             case "Pick position":
-                mpos_g = self.game.grid.xfm_pg(pygame.mouse.get_pos())
+                mpos_g = self.game.grid.xfm_pg(self.game._mpos)
                 self.pos = mpos_g
                 self.update_force_vector()
             case _:
@@ -672,19 +930,11 @@ class Player:
         else:
             self.game.physics.force_vector = (0,0)
 
-    @property
-    def color_line(self) -> Color:
-        if self.game.settings['setting_dark_mode']:
-            return self.game.colors[f'color_player_{self.n}_line_dark']
-        else:
-            return self.game.colors[f'color_player_{self.n}_line_light']
-
-    @property
-    def color_final(self) -> Color:
-        if self.game.settings['setting_dark_mode']:
-            return self.game.colors[f'color_player_{self.n}_final_dark']
-        else:
-            return self.game.colors[f'color_player_{self.n}_final_light']
+    def rebuild_palette(self) -> None:
+        """Set 'self.color_line' and 'self.color_final' for the current dark/light mode."""
+        mode = 'dark' if self.game.settings['setting_dark_mode'] else 'light'
+        self.color_line = self.game.colors[f'color_player_{self.n}_line_{mode}']
+        self.color_final = self.game.colors[f'color_player_{self.n}_final_{mode}']
 
 
 def get_next_player(active_player:int, num_players:int) -> int:
@@ -708,10 +958,14 @@ def get_next_player(active_player:int, num_players:int) -> int:
     if next_player == 0: next_player = num_players
     return next_player
 
+# Frame rate cap, and frame time in milliseconds: longest an idle game loop waits for an event
+FRAMERATE = 60
+FRAME_MS = 1000 // FRAMERATE
+
 class Game:
     def __init__(self):
+        os.environ["SDL_RENDER_VSYNC"] = "1"            # SDL_HINT_RENDER_VSYNC: SDL renderers present on vsync
         pygame.init()                                   # Init pygame -- quit in shutdown
-        pygame.font.init()                              # Initialize the font module
         # pygame.mouse.set_visible(False)                 # Hide the OS mouse icon
         pygame.display.set_caption("Cannon game")
 
@@ -719,12 +973,35 @@ class Game:
         # os.environ["SDL_VIDEO_WINDOW_POS"] = "1000,0"   # Position window in upper right
 
         self.os_window = OsWindow((100*16, 100*9), is_fullscreen=False) # Track OS Window size and flags
-        self.surfs = define_surfaces(self.os_window)    # Dict of Pygame Surfaces (including pygame.display)
+        self.surf_pool = SurfacePool(self.os_window)    # Reuse Surfaces when the window size changes
+        self.surfs = define_surfaces(self.os_window, self.surf_pool) # Dict of Pygame Surfaces (including pygame.display)
         self.settings = define_settings()               # Dict of game settings
         self.colors = define_colors()                   # Dict of pygame Colors
 
         # Game Data
         self.grid = Grid(self, N=40)
+        self._history_dirty = True                      # Redraw 'surf_history' on the next frame
+        self._resize_event = None                       # Latest WINDOWRESIZED event, not handled yet
+        self._dirty = True                              # Redraw and update the OS window on the next frame
+        self._is_idle = False                           # True if the last frame skipped drawing
+        self._mpos = None                               # Mouse position this frame (pixel coordinates)
+        self._event_handlers = {                        # Dict of event handlers: {event.type: handler(event)}
+                pygame.QUIT: self.handle_quit,
+                pygame.WINDOWRESIZED: self.stash_windowresized,
+                pygame.KEYDOWN: self.handle_keydown,
+                pygame.MOUSEWHEEL: self.handle_mousewheel,
+                pygame.MOUSEBUTTONDOWN: self.handle_mousebuttondown,
+                pygame.MOUSEBUTTONUP: self.handle_mousebuttonup,
+                pygame.WINDOWDISPLAYCHANGED: self.os_window.handle_WINDOWDISPLAYCHANGED,
+                pygame.WINDOWEXPOSED: self.handle_window_shown,
+                pygame.WINDOWRESTORED: self.handle_window_shown,
+                }
+        # Let SDL drop the events the game has no use for (MOUSEMOTION, KEYUP,
+        # other WINDOW*, TEXTINPUT, ...) so event.get() never returns them.
+        # Mouse position and held keys are polled, so they still update.
+        self._event_types = list(self._event_handlers)  # List of handled event types
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self._event_types)
         self.is_stepping = False
         self.physics = Physics()
         self.active_player = 1
@@ -734,30 +1011,75 @@ class Game:
             n = i+1
             # self.players[f'player_{n}'] = Player(self.colors[f'color_player_{n}'])
             self.players[f'player_{n}'] = Player(self, n)
+        self._rebuild_palette()                         # Set color attributes for dark/light mode
 
-        # FPS
+        # Fonts and text labels (load each size once and reuse the labels)
+        self._xlabel = Text((0,0), font_size=15, sys_font="Roboto Mono")
+        self._ylabel = Text((0,0), font_size=15, sys_font="Roboto Mono")
+        self._arrow_buf = [None]*3                      # Reusable arrow head point list
+        self.debug_hud = DebugHud(self)                 # Shown if 'setting_debug'
+
+        # FPS (caps the framerate without vsync, see 'game_loop()')
         self.clock = pygame.time.Clock()
 
     def run(self) -> None:
         while True: self.game_loop()
 
     def game_loop(self) -> None:
-        # DebugHud
-        if self.settings['setting_debug']: self.debug_hud = DebugHud(self)
-        else: self.debug_hud = None
-
-        if self.debug_hud: self.add_debug_text()
+        # Wait for the next frame BEFORE polling input, not after drawing.
+        # Input polled right after the sleep is a frame fresher when it is drawn
+        # (this is how raylib orders its frame: wait, poll, update, draw).
+        # If the last frame was skipped because nothing changed, sleep in SDL
+        # until an event arrives or the frame time is up: input wakes the loop
+        # right away. Otherwise only sleep for what is left of the frame: with
+        # vsync, display.flip() already waited, without it clock.tick() caps
+        # the framerate.
+        ### pygame.event.wait(timeout) -> Event (NOEVENT if it times out)
+        ### clock.tick(framerate=0) -> milliseconds
+        first_event = None
+        if self._is_idle:
+            first_event = pygame.event.wait(timeout=FRAME_MS)
+            self.clock.tick() # Only measure FPS, do not sleep
+        elif self.os_window.is_vsync:
+            self.clock.tick() # Only measure FPS, do not sleep
+        else:
+            self.clock.tick(FRAMERATE)
 
         # UI
-        self.handle_ui_events()
-        if self.is_stepping: self.step_physics()
+        self.handle_ui_events(first_event)
+        if self._resize_event:
+            self.handle_windowresized(self._resize_event)
+            self._resize_event = None
+        # Hold 'n' to advance the simulation.
+        # Poll the key state once per frame instead of tracking KEYDOWN/KEYUP
+        # events (on some Linux setups, key events are buffered and lag).
+        self.is_stepping = pygame.key.get_pressed()[pygame.K_n]
+        if self.is_stepping:
+            self.step_physics()
+            self._dirty = True
+        # Get the mouse position once per frame: everything below reads 'self._mpos'
+        mpos = pygame.mouse.get_pos()
+        if mpos != self._mpos:
+            # The mouse dot and mouse vector follow the mouse
+            self._mpos = mpos
+            self._dirty = True
         if self.grid.is_panning:
-            self.grid.pan(pygame.mouse.get_pos())
+            self.grid.pan(self._mpos)
+            self._history_dirty = True
+            self._dirty = True
         self.player.update() # Do physics in this update
 
+        # Skip drawing if nothing changed since the last frame
+        self._is_idle = not (self._dirty or self._history_dirty)
+        if self._is_idle: return
+
+        # DebugHud (after UI, so the debug text shows this frame's input)
+        if self.settings['setting_debug']:
+            self.debug_hud.clear_text()
+            self.add_debug_text()
+
         # Game art
-        self.surfs['surf_game_art'].fill(self.color_graph_paper_bgnd)
-        self.grid.draw(self.surfs['surf_game_art'])
+        self.grid.draw(self.surfs['surf_game_art']) # Fills the background too
         self.draw_mouse_as_snapped_dot(self.surfs['surf_game_art'])
         self.draw_mouse_vector(self.surfs['surf_game_art'])
         self.draw_game_history(self.surfs['surf_game_art'])
@@ -768,18 +1090,18 @@ class Game:
         self.surfs['surf_os_window'].blit(self.surfs['surf_game_art'], (0,0))
 
         # Add overlays to OS window
-        if self.debug_hud:
+        if self.settings['setting_debug']:
             self.debug_hud.render()
 
         # Draw to the actual OS window
-        pygame.display.update()
-
-        ### clock.tick(framerate=0) -> milliseconds
-        self.clock.tick(60)
+        # The whole window is redrawn, so flip() (no dirty rect list to check).
+        # With vsync this is one SDL_RenderPresent that waits for the refresh.
+        pygame.display.flip()
+        self._dirty = False
 
     def add_debug_text(self) -> None:
         # Track mouse position in game coordinates
-        mpos_p = pygame.mouse.get_pos()             # Mouse in pixel coord sys
+        mpos_p = self._mpos                         # Mouse in pixel coord sys
         mpos_g = self.grid.xfm_pg(mpos_p)           # Mouse in game coord sys
         self.debug_hud.add_text(f"Mouse (game): {mpos_g}")
         # Display gravity on/off
@@ -791,103 +1113,126 @@ class Game:
         self.debug_hud.add_text(f"Player state: {self.player.state}")
         self.debug_hud.add_text(f"Physics line_seg: {self.physics.line_seg}")
         if 0:
-            for player_n in self.players:
-                player = self.players[player_n]
+            for player_n, player in self.players.items():
                 self.debug_hud.add_text(f"Player {player_n} history head: {player.game_history.head}")
                 vectors_str_list = [f"Player {player_n} Vector: " + str(l.vector) for l in player.game_history.line_segs]
                 vectors_str = "\n".join(vectors_str_list)
                 self.debug_hud.add_text(f"{vectors_str}")
 
 
-    def handle_ui_events(self) -> None:
-        kmod = pygame.key.get_mods()                    # Which modifier keys are held
+    def handle_ui_events(self, first_event:pygame.event.Event=None) -> None:
+        """Handle all queued events.
+
+        :param first_event:pygame.event.Event -- event already taken off the queue by 'pygame.event.wait()'
+
+        Dispatch each event with one dict lookup in 'self._event_handlers'.
+        """
+        handlers = self._event_handlers
+        # Every event that reaches the queue is handled, so redraw after any event
+        if first_event and first_event.type != pygame.NOEVENT:
+            self._dirty = True
+            handlers.get(first_event.type, self.handle_ignored_event)(first_event)
+        # Fast path: an empty queue is the common case, skip building an empty list
+        ### peek(eventtype=None) -> bool
+        if not pygame.event.peek(self._event_types): return
+        self._dirty = True
         for event in pygame.event.get():
-            match event.type:
-                # No use for these events yet
-                case pygame.AUDIODEVICEADDED: pass
-                case pygame.ACTIVEEVENT: pass
-                case pygame.MOUSEMOTION: pass
-                case pygame.WINDOWENTER: pass
-                case pygame.WINDOWLEAVE: pass
-                case pygame.WINDOWEXPOSED: pass
-                case pygame.VIDEOEXPOSE: pass
-                case pygame.WINDOWHIDDEN: pass
-                case pygame.WINDOWMOVED: pass
-                # case pygame.WINDOWSIZECHANGED: pass
-                # case pygame.VIDEORESIZE: pass
-                case pygame.WINDOWSHOWN: pass
-                case pygame.WINDOWFOCUSGAINED: pass
-                case pygame.WINDOWFOCUSLOST: pass
-                case pygame.WINDOWTAKEFOCUS: pass
-                case pygame.TEXTINPUT: pass
-                # Handle these events
-                case pygame.QUIT: sys.exit()
-                case pygame.WINDOWRESIZED:
-                    self.os_window.handle_WINDOWRESIZED(event) # Update OS window size
-                    self.update_surfaces() # Update surfaces affected by OS window size
-                    logger.debug(f"game art: {self.surfs['surf_game_art'].get_size()}")
-                    # Resize and recenter the grid
-                    self.grid.reset()
-                case pygame.KEYDOWN: self.handle_keydown(event)
-                case pygame.KEYUP: self.handle_keyup(event)
-                case pygame.MOUSEWHEEL:
-                    ### {'flipped': False, 'x': 0, 'y': 1, 'precise_x': 0.0, 'precise_y': 1.0, 'touch': False, 'window': None}
-                    match event.y:
-                        case 1: self.grid.zoom_in()
-                        case -1: self.grid.zoom_out()
-                        case _: pass
-                case pygame.MOUSEBUTTONDOWN:
-                    match event.button:
-                        case 1:
-                            logger.debug("Left-click")
-                            if kmod & pygame.KMOD_SHIFT:
-                                # Let shift+left-click be my panning
-                                # because I cannot do right-click-and-drag on the trackpad
-                                self.handle_mousebuttondown_rightclick()
-                            else:
-                                self.handle_mousebuttondown_leftclick()
-                        case 2:
-                            logger.debug("Middle-click")
-                            self.handle_mousebuttondown_middleclick()
-                        case 3:
-                            logger.debug("Right-click")
-                            self.handle_mousebuttondown_rightclick()
-                        case 4: logger.debug("Mousewheel y=+1")
-                        case 5: logger.debug("Mousewheel y=-1")
-                        case 6: logger.debug("Logitech G602 Thumb button 6")
-                        case 7: logger.debug("Logitech G602 Thumb button 7")
-                        case _: logger.debug(event)
-                case pygame.MOUSEBUTTONUP:
-                    match event.button:
-                        case 1:
-                            if kmod & pygame.KMOD_SHIFT:
-                                logger.debug("Shift+Left mouse button released")
-                                self.handle_mousebuttonup_rightclick()
-                        case 2:
-                            logger.debug("Middle mouse button released")
-                            self.handle_mousebuttonup_middleclick()
-                        case 3:
-                            logger.debug("Right mouse button released")
-                            self.handle_mousebuttonup_rightclick()
-                        case _: logger.debug(event)
-                # Log any other events
-                case _:
-                    logger.debug(f"Ignored event: {pygame.event.event_name(event.type)}")
-    def handle_keyup(self, event) -> None:
-        komd = pygame.key.get_mods()
-        match event.key:
-            case pygame.K_n:
-                self.is_stepping = False
+            handlers.get(event.type, self.handle_ignored_event)(event)
+
+    def handle_ignored_event(self, event) -> None:
+        """Log any other events."""
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Ignored event: %s", pygame.event.event_name(event.type))
+
+    def handle_quit(self, event) -> None:
+        sys.exit()
+
+    def handle_window_shown(self, event) -> None:
+        """The window was uncovered or un-minimized: its pixels may be gone.
+
+        Redraw on the next frame, even if the game is idle.
+        """
+        self._dirty = True
+
+    def stash_windowresized(self, event) -> None:
+        """SDL sends a storm of these while the window is dragged.
+
+        Only the last one matters: stash it, handle it once in game_loop.
+        """
+        self._resize_event = event
+
+    def handle_mousewheel(self, event) -> None:
+        ### {'flipped': False, 'x': 0, 'y': 1, 'precise_x': 0.0, 'precise_y': 1.0, 'touch': False, 'window': None}
+        match event.y:
+            case 1: self.grid.zoom_in()
+            case -1: self.grid.zoom_out()
+            case _: pass
+        self._history_dirty = True
+
+    def handle_mousebuttondown(self, event) -> None:
+        kmod = pygame.key.get_mods()                    # Which modifier keys are held
+        match event.button:
+            case 1:
+                logger.debug("Left-click")
+                if kmod & pygame.KMOD_SHIFT:
+                    # Let shift+left-click be my panning
+                    # because I cannot do right-click-and-drag on the trackpad
+                    self.handle_mousebuttondown_rightclick()
+                else:
+                    self.handle_mousebuttondown_leftclick()
+            case 2:
+                logger.debug("Middle-click")
+                self.handle_mousebuttondown_middleclick()
+            case 3:
+                logger.debug("Right-click")
+                self.handle_mousebuttondown_rightclick()
+            case 4: logger.debug("Mousewheel y=+1")
+            case 5: logger.debug("Mousewheel y=-1")
+            case 6: logger.debug("Logitech G602 Thumb button 6")
+            case 7: logger.debug("Logitech G602 Thumb button 7")
+            case _: logger.debug(event)
+
+    def handle_mousebuttonup(self, event) -> None:
+        kmod = pygame.key.get_mods()                    # Which modifier keys are held
+        match event.button:
+            case 1:
+                if kmod & pygame.KMOD_SHIFT:
+                    logger.debug("Shift+Left mouse button released")
+                    self.handle_mousebuttonup_rightclick()
+            case 2:
+                logger.debug("Middle mouse button released")
+                self.handle_mousebuttonup_middleclick()
+            case 3:
+                logger.debug("Right mouse button released")
+                self.handle_mousebuttonup_rightclick()
+            case _: logger.debug(event)
+
+    def handle_windowresized(self, event) -> None:
+        """Resize surfaces and the grid to the new OS window size.
+
+        Called once per frame with the last WINDOWRESIZED event of the frame.
+        """
+        self.os_window.handle_WINDOWRESIZED(event) # Update OS window size
+        self.update_surfaces() # Update surfaces affected by OS window size
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("game art: %s", self.surfs['surf_game_art'].get_size())
+        # Resize and recenter the grid
+        self.grid.reset()
+        self._history_dirty = True
+        self._dirty = True
+
     def handle_keydown(self, event) -> None:
         kmod = pygame.key.get_mods()                    # Which modifier keys are held
+        self._dirty = True
         match event.key:
             case pygame.K_q: sys.exit()                 # q - Quit
             case pygame.K_F11:
                 self.os_window.toggle_fullscreen() # F11 - toggle fullscreen
-                self.surfs = define_surfaces(self.os_window)
+                self.surfs = define_surfaces(self.os_window, self.surf_pool)
                 logger.debug(f"game art: {self.surfs['surf_game_art'].get_size()}")
                 # Resize and recenter the grid
                 self.grid.reset()
+                self._history_dirty = True
             case pygame.K_F2:
                 self.settings['setting_debug'] = not self.settings['setting_debug']
                 logger.debug(f"Debug: {self.settings['setting_debug']}")
@@ -899,12 +1244,12 @@ class Game:
                     # Reset latest physics velocity vector
                     self.physics.line_seg = LineSeg(None,None)
                     # Reset game history for all players
-                    for player_n in self.players:
-                        player = self.players[player_n]
+                    for player in self.players.values():
                         player.reset()
                 else:
                     self.player.game_history.redo()
                     # self.game_history.redo()
+                self._history_dirty = True
             case pygame.K_ESCAPE: self.physics.line_seg = LineSeg(None,None)
             case pygame.K_F10: self.toggle_gravity()
             case pygame.K_u:
@@ -919,17 +1264,18 @@ class Game:
                     # Set position to initial position
                     self.player.pos = self.player.init_pos
                     # Set initial velocity to (0,0)
-                    self.physics.line_seg.start = self.player.pos
-                    self.physics.line_seg.end = self.player.pos
+                    self.physics.line_seg = LineSeg(self.player.pos, self.player.pos)
                     # Sum to find final_seg
                     l = self.physics.line_seg
                     self.player.update_force_vector()
-                    v = self.physics.force_vector
-                    self.physics.final_seg = LineSeg(l.start, (l.end[0]+v[0], l.end[1]+v[1]))
+                    ex, ey = l.end
+                    fx, fy = self.physics.force_vector
+                    self.physics.final_seg = LineSeg(l.start, (ex + fx, ey + fy))
                     # Store line segment, force vector, and final segment in history.
                     self.player.game_history.record(self.physics)
                 else:
-                    self.player.pos = self.player.game_history.final_segs[head].end
+                    self.player.pos = self.player.game_history.final_seg(head).end
+                self._history_dirty = True
             case pygame.K_TAB:
                 self.set_next_player()
                 # If next player hasn't been positioned yet, reset the latest physics line seg
@@ -939,7 +1285,7 @@ class Game:
                     case _:
                         pass
             case pygame.K_SPACE: self.step_physics()
-            case pygame.K_n: self.is_stepping = True
+            case pygame.K_n: pass                       # n - Held key is polled in game_loop
             case _:
                 logger.debug(f"{event.unicode}")
 
@@ -949,14 +1295,14 @@ class Game:
                 self.player.init_pos = self.player.pos
                 self.player.state = "Step physics"
                 # Set initial velocity to (0,0)
-                self.physics.line_seg.start = self.player.pos
-                self.physics.line_seg.end = self.player.pos
+                self.physics.line_seg = LineSeg(self.player.pos, self.player.pos)
                 # Sum to find final_seg
                 l = self.physics.line_seg
                 v = self.physics.force_vector
                 self.physics.final_seg = LineSeg(l.start, (l.end[0]+v[0], l.end[1]+v[1]))
                 # Store line segment, force vector, and final segment in history.
                 self.player.game_history.record(self.physics)
+                self._history_dirty = True
             case _:
                 pass
 
@@ -976,12 +1322,21 @@ class Game:
         self.handle_mousebuttonup_middleclick()
 
     def update_surfaces(self) -> None:
-        """Call this after os_window handles WINDOWRESIZED event. See 'define_surfaces()'"""
-        self.surfs['surf_game_art'] = pygame.Surface(self.os_window.size, flags=pygame.SRCALPHA)
-        self.surfs['surf_draw'] = pygame.Surface(self.os_window.size, flags=pygame.SRCALPHA)
+        """Call this after os_window handles WINDOWRESIZED event. See 'define_surfaces()'
+
+        Reuse the surfaces (a view of their top-left) while the window fits
+        in them, instead of allocating new ones. See 'SurfacePool'.
+        """
+        size = self.os_window.size
+        self.surfs['surf_game_art'] = self.surf_pool.get('surf_game_art', size, alpha=False)
+        self.surfs['surf_history'] = self.surf_pool.get('surf_history', size)
+        self._history_dirty = True
+        self._dirty = True
 
     def toggle_dark_mode(self) -> None:
         self.settings['setting_dark_mode'] = not self.settings['setting_dark_mode']
+        self._rebuild_palette()
+        self._history_dirty = True
 
     def toggle_gravity(self) -> None:
         self.settings['setting_gravity_on'] = not self.settings['setting_gravity_on']
@@ -1003,29 +1358,34 @@ class Game:
         """Step the physics simulation for the active player."""
         match self.player.state:
             case "Step physics":
-                logger.debug(f"STEP player {self.active_player}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("STEP player %d", self.active_player)
                 # To be in this state, it is guaranteed that the game history is not empty
                 if self.player.game_history.head == None:
                     sys.exit("ERROR: Expected self.player.game_history.head != None")
                 # Take the latest final segment
                 head = self.player.game_history.head
-                last_f = self.player.game_history.final_segs[head]
-                # Make a next line segment
-                next_l = LineSeg((last_f.start[0] + last_f.vector[0],
-                                  last_f.start[1] + last_f.vector[1]),
-                                 (last_f.end[0] + last_f.vector[0],
-                                  last_f.end[1] + last_f.vector[1]))
+                last_f = self.player.game_history.final_seg(head)
+                # Unpack the latest final segment and its vector into locals
+                sx, sy = last_f.start
+                ex, ey = last_f.end
+                vx, vy = ex - sx, ey - sy
+                # Make a next line segment: the latest final segment moved along its own vector
+                nsx, nsy = sx + vx, sy + vy
+                nex, ney = ex + vx, ey + vy
+                next_l = LineSeg((nsx, nsy), (nex, ney))
                 ### Apply a force vector
                 self.player.update_force_vector()
                 # Add force to prev velocity to get new vector
-                v = self.physics.force_vector
-                next_f = LineSeg(next_l.start, (next_l.end[0] + v[0], next_l.end[1] + v[1]))
+                fx, fy = self.physics.force_vector
+                next_f = LineSeg((nsx, nsy), (nex + fx, ney + fy))
                 # Move player to new position
                 self.player.pos = next_f.end
                 # Record the next line segment
                 self.physics.line_seg = next_l
                 self.physics.final_seg = next_f
                 self.player.game_history.record(self.physics)
+                self._history_dirty = True
             case _:
                 pass
 
@@ -1036,6 +1396,13 @@ class Game:
 
         Return point in pixel coordinates, but snapped to the grid.
         """
+        a,b,c,d,e,f = self.grid.coeffs
+        if b == 0 and c == 0:
+            # Grid is axis-aligned (see 'Grid.reset()'): snap in pixel coordinates,
+            # no round trip through 'xfm_pg()' (and its determinant)
+            # Same snap as 'xfm_pg(p=0)': nearest int, halves round up
+            floor = math.floor
+            return (floor((point[0] - e)/a + 0.5)*a + e, floor((point[1] - f)/d + 0.5)*d + f)
         # Xfm position from pixel to grid with precision=0 to snap to grid
         snapped_g = self.grid.xfm_pg(point, p=0)
         # Xfm back to pixels to get "snapped" pixel coordinates
@@ -1050,7 +1417,7 @@ class Game:
             radius = grid_size/4
         else:
             # Move dot with mouse
-            snapped = self.snap_to_grid(pygame.mouse.get_pos())
+            snapped = self.snap_to_grid(self._mpos)
             radius = grid_size/3
         ### circle(surface, color, center, radius) -> Rect
         pygame.draw.circle(surf, self.player.color_final, snapped, radius)
@@ -1062,7 +1429,7 @@ class Game:
             # tail = self.grid.xfm_gp(self.physics.line_seg.start)
             # head = self.snap_to_grid(pygame.mouse.get_pos())
             tail = self.physics.line_seg.start
-            head = self.grid.xfm_pg(self.snap_to_grid(pygame.mouse.get_pos()))
+            head = self.grid.xfm_pg(self.snap_to_grid(self._mpos))
             l = LineSeg(start=tail, end=head)
             # Draw line segment as a vector (a line with an arrow head)
             self.draw_line_as_vector(surf, l, self.player.color_line)
@@ -1070,32 +1437,97 @@ class Game:
             self.draw_xy_components(surf, l, self.color_pop)
 
     def draw_game_history(self, surf:pygame.Surface) -> None:
-        """Draw all line segments and forces in the game history as vectors."""
-        for player_n in self.players:
-            player = self.players[player_n]
+        """Draw all line segments and forces in the game history as vectors.
+
+        The game history art is cached on 'surf_history'. It is only redrawn
+        when 'self._history_dirty' is set: record, undo, redo, reset, pan,
+        zoom, resize, and dark mode toggle all set it. On every other frame,
+        drawing the game history is a single blit.
+        """
+        if self._history_dirty:
+            self.surfs['surf_history'].fill(Color(0,0,0,0))
+            self.draw_history_vectors(self.surfs['surf_history'])
+            self._history_dirty = False
+        surf.blit(self.surfs['surf_history'], (0,0))
+
+    def draw_history_vectors(self, surf:pygame.Surface) -> None:
+        """Draw every vector in every player's game history.
+
+        Take every vector in the history straight from the game history
+        arrays, then do the pixel transform and arrow head math for all of
+        them in one NumPy pass (see '_arrow_geometry'). The draw loop just
+        issues the pygame draw calls.
+        """
+        starts = []                                     # Vector tails in game coordinates
+        ends = []                                       # Vector heads in game coordinates
+        colors = []                                     # Color of each vector
+        for player in self.players.values():
             if player.game_history.head == None:
                 pass
             else:
-                for i in range(player.game_history.head+1):
-                    ### Draw the player's velocity vector
-                    l = player.game_history.line_segs[i]
-                    self.draw_line_as_vector(surf, l, player.color_line)
-                    ### Draw the force vector
-                    v = player.game_history.force_vectors[i]
-                    # Define line segment 'v_l': translate vector 'v' to the end of line segment 'l'
-                    v_l = LineSeg(
-                            (l.end[0],          l.end[1]),
-                            (l.end[0] + v[0],   l.end[1] + v[1]))
-                    self.draw_line_as_vector(surf, v_l, self.color_mouse_vector)
-                    ### Draw the final vector
-                    f = player.game_history.final_segs[i]
-                    self.draw_line_as_vector(surf, f, player.color_final)
-
+                n = player.game_history.head+1
+                data = player.game_history.data[:n]
+                l = data['line_seg']                    # (n,2,2): start and end of each line segment
+                v = data['force_vector']                # (n,2)
+                f = data['final_seg']                   # (n,2,2)
+                # Draw three vectors per iteration, in this order:
+                #   the player's velocity vector,
+                #   the force vector (translated to the end of the velocity vector),
+                #   the final vector
+                starts.append(np.stack([l[:,0], l[:,1], f[:,0]], axis=1).reshape(-1,2))
+                ends.append(np.stack([l[:,1], l[:,1] + v, f[:,1]], axis=1).reshape(-1,2))
+                colors += [player.color_line, self.color_mouse_vector, player.color_final]*n
+        if len(starts) == 0: return
+        # Convert to pixel coordinates
+        starts_p = self.grid.xfm_gp_batch(np.concatenate(starts).astype(float))
+        ends_p = self.grid.xfm_gp_batch(np.concatenate(ends).astype(float))
+        # Set the arrow head size relative to the grid size (same as 'draw_line_as_vector')
+        grid_size = min(abs(self.grid.size[0]), abs(self.grid.size[1]))
+        a = grid_size*2/3 # a: arrow head triangle height is 2/3 the length of a grid box
+        b = grid_size*1/5 # b: arrow head triangle base is 1/5 the length of a grid box
+        width = max(1, int(grid_size/6)) # Scale line width to grid size
+        arrow_polys, shaft_bases = self._arrow_geometry(starts_p, ends_p, a, b)
+        # Convert to lists once (pygame unpacks Python floats faster than NumPy scalars)
+        starts_p = starts_p.tolist()
+        arrow_polys = arrow_polys.tolist()
+        shaft_bases = shaft_bases.tolist()
+        for i, color in enumerate(colors):
+            # Draw the arrow head
+            pygame.draw.polygon(surf, color, arrow_polys[i])
+            # Draw the arrow shaft
+            pygame.draw.line(surf, color, starts_p[i], shaft_bases[i], width)
+
+    def _arrow_geometry(self, starts:np.ndarray, ends:np.ndarray, a:float, b:float) -> tuple:
+        """Return arrow head points and arrow shaft ends for many vectors at once.
+
+        :param starts:np.ndarray -- (N,2) array of vector tails in pixel coordinates
+        :param ends:np.ndarray -- (N,2) array of vector heads in pixel coordinates
+        :param a:float -- arrow head triangle height in pixels
+        :param b:float -- arrow head triangle half-base in pixels
+        :return tuple -- (arrow_polys, shaft_bases)
+            arrow_polys:np.ndarray -- (N,3,2) array: arrow head tip and two base corners
+            shaft_bases:np.ndarray -- (N,2) array: end of the arrow shaft
+
+        This is the math in 'draw_line_as_vector', vectorized.
+        """
+        # Get the vectors from the line segments
+        v = ends - starts
+        # Get the unit vectors (a vector with length 0 has unit vector (0,0))
+        d = np.hypot(v[:,0], v[:,1])
+        u = np.divide(v, d[:,None], out=np.zeros_like(v), where=d[:,None]!=0)
+        # Get the perpendicular unit vectors
+        up = np.column_stack([-u[:,1], u[:,0]])
+        # Find the pixel coordinate of the base of each arrow head triangle
+        base = ends - a*u
+        # Describe each arrow head as three points
+        arrow_polys = np.stack([ends, base - b*up, base + b*up], axis=1)
+        # Extend the arrow shaft into the arrow head to avoid gaps between pygame line and arrow head
+        shaft_bases = ends - (a/2)*u
+        return (arrow_polys, shaft_bases)
 
     def draw_players(self, surf:pygame.Surface) -> None:
         """Draw player positions."""
-        for player_n in self.players:
-            player = self.players[player_n]
+        for player in self.players.values():
             match player.state:
                 case "Pick position":
                     pass
@@ -1125,11 +1557,13 @@ class Game:
           A thick line from the vector tail to the base of the arrow head.
         """
         # Convert to pixel coordinates
-        l = LineSeg(self.grid.xfm_gp(l.start), self.grid.xfm_gp(l.end))
+        a,b,c,d,e,f = self.grid.coeffs
+        (sx, sy), (ex, ey) = l.start, l.end
+        l = LineSeg((a*sx + b*sy + e, c*sx + d*sy + f), (a*ex + b*ey + e, c*ex + d*ey + f))
         # Get the vector from the line segment
         v = l.vector
         # Get the unit vector
-        v_dist = math.sqrt(v[0]**2 + v[1]**2)
+        v_dist = math.hypot(v[0], v[1])
         # Use 'if/else' to avoid div by 0 (in case vector has length 0)
         if v_dist == 0:
             unit_v = (0,0)
@@ -1139,17 +1573,17 @@ class Game:
         unit_vp = (-1*unit_v[1], unit_v[0])
         # Set the arrow head size relative to the grid size
         grid_size = min(abs(self.grid.size[0]), abs(self.grid.size[1]))
-        a = grid_size*2/3 # a: arrow head triangle height is 2/3 the length of a grid box
-        b = grid_size*1/5 # a: arrow head triangle base is 1/5 the length of a grid box
+        head_h = grid_size*2/3 # head_h: arrow head triangle height is 2/3 the length of a grid box
+        head_w = grid_size*1/5 # head_w: arrow head triangle base is 1/5 the length of a grid box
         # Define a vector that is the arrow head from base to tip
-        arrow_head_v = (a*unit_v[0], a*unit_v[1])
+        arrow_head_v = (head_h*unit_v[0], head_h*unit_v[1])
         # Fine the pixel coordinate of the base of the arrow head triangle
         base = (l.end[0] - arrow_head_v[0], l.end[1] - arrow_head_v[1])
-        # Describe the arrow head as a list of three points
-        arrow_head_points = [ l.end,
-                              (base[0] - b*unit_vp[0], base[1] - b*unit_vp[1]),
-                              (base[0] + b*unit_vp[0], base[1] + b*unit_vp[1])
-                             ]
+        # Describe the arrow head as three points (overwrite the reusable list)
+        arrow_head_points = self._arrow_buf
+        arrow_head_points[0] = l.end
+        arrow_head_points[1] = (base[0] - head_w*unit_vp[0], base[1] - head_w*unit_vp[1])
+        arrow_head_points[2] = (base[0] + head_w*unit_vp[0], base[1] + head_w*unit_vp[1])
         # Draw the arrow head
         pygame.draw.polygon(surf, color, arrow_head_points)
         # Draw the arrow shaft
@@ -1165,6 +1599,9 @@ class Game:
         l:LineSeg -- Line segment in game coordinates
         color:Color -- Color of lines and text
         """
+        # A zero vector has no components to draw
+        if l.start == l.end: return
+
         start = self.grid.xfm_gp(l.start)
         end = self.grid.xfm_gp(l.end)
 
@@ -1183,26 +1620,34 @@ class Game:
             xstop = abs(l.vector[0])+1
         else:
             xstop = abs(l.vector[0])
-        for i in range(1, xstop):
-            x = l.start[0] + signum(l.vector[0])*i
-            y = l.start[1]
-            tick_p = self.grid.xfm_gp((x,y))
-            tick = LineSeg((tick_p[0], tick_p[1]-tick_len),
-                           (tick_p[0], tick_p[1]+tick_len))
-            pygame.draw.line(surf, color, tick.start, tick.end, width=max(1,int(grid_size/20)))
-        for i in range(1, abs(l.vector[1])):
-            x = l.end[0]
-            y = l.end[1] - signum(l.vector[1])*i
-            tick_p = self.grid.xfm_gp((x,y))
-            tick = LineSeg((tick_p[0]-tick_len, tick_p[1]),
-                           (tick_p[0]+tick_len, tick_p[1]))
-            pygame.draw.line(surf, color, tick.start, tick.end, width=max(1,int(grid_size/20)))
+        tick_width = max(1,int(grid_size/20))
+        # Tick direction along each axis: -1, 0, or 1 (computed once, not per tick)
+        vx, vy = l.vector
+        sgn_x = signum(vx)
+        sgn_y = signum(vy)
+        sx, sy = l.start
+        ex, ey = l.end
+        # Transform all tick positions to pixel coordinates in one batch
+        xs = np.arange(1, max(1, xstop))
+        xticks_g = np.column_stack([sx + sgn_x*xs, np.full(len(xs), sy)])
+        ys = np.arange(1, max(1, abs(vy)))
+        yticks_g = np.column_stack([np.full(len(ys), ex), ey - sgn_y*ys])
+        # Draw each tick from precomputed pixel coordinates
+        for tick_p in self.grid.xfm_gp_batch(xticks_g).tolist():
+            pygame.draw.line(surf, color,
+                             (tick_p[0], tick_p[1]-tick_len),
+                             (tick_p[0], tick_p[1]+tick_len), width=tick_width)
+        for tick_p in self.grid.xfm_gp_batch(yticks_g).tolist():
+            pygame.draw.line(surf, color,
+                             (tick_p[0]-tick_len, tick_p[1]),
+                             (tick_p[0]+tick_len, tick_p[1]), width=tick_width)
 
         if l.vector[0] != 0:
             # Label x component
-            xlabel = Text((0,0), font_size=max(15,int(grid_size)), sys_font="Roboto Mono")
+            xlabel = self._xlabel
+            xlabel.font = load_font("Roboto Mono", max(15,int(grid_size)))
             xlabel.update(f"{l.vector[0]}")
-            xlabel_w = xlabel.font.size(xlabel.text_lines[0])[0]
+            xlabel_w = measure_text(xlabel.font, xlabel.text_lines[0])[0]
             xlabel_h = xlabel.font.get_linesize()*len(xlabel.text_lines)
             if l.vector[1] < 0:
                 # If y-component is NEGATIVE, align center BOTTOM of label to midpoint of the x-component
@@ -1213,87 +1658,33 @@ class Game:
             xlabel.render(surf, color)
         if l.vector[1] != 0:
             # Label y component
-            ylabel = Text((0,0), font_size=max(15,int(grid_size)), sys_font="Roboto Mono")
+            ylabel = self._ylabel
+            ylabel.font = load_font("Roboto Mono", max(15,int(grid_size)))
             ylabel.update(f"{l.vector[1]}")
-            ylabel_w = ylabel.font.size(ylabel.text_lines[0])[0]
+            ylabel_w = measure_text(ylabel.font, ylabel.text_lines[0])[0]
             ylabel_h = ylabel.font.get_linesize()*len(ylabel.text_lines)
             if l.vector[0] < 0:
                 # If x-component is NEGATIVE, align center LEFT of label to midpoint of the y-component
-                ylabel.pos = (yline.midpoint[0] - ylabel_w - ylabel.font.size("0")[0]/2, yline.midpoint[1] - ylabel_h/2)
+                ylabel.pos = (yline.midpoint[0] - ylabel_w - measure_text(ylabel.font, "0")[0]/2, yline.midpoint[1] - ylabel_h/2)
             else:
                 # If x-component is POSITIVE, align center RIGHT of label to midpoint of the y-component
-                ylabel.pos = (yline.midpoint[0] + ylabel.font.size("0")[0]/2, yline.midpoint[1] - ylabel_h/2)
+                ylabel.pos = (yline.midpoint[0] + measure_text(ylabel.font, "0")[0]/2, yline.midpoint[1] - ylabel_h/2)
             ylabel.render(surf, color)
 
-    @property
-    def color_debug_hud(self) -> Color:
-        if self.settings['setting_dark_mode']:
-            return self.colors['color_debug_hud_dark']
-        else:
-            return self.colors['color_debug_hud_light']
-
-    @property
-    def color_graph_paper_bgnd(self) -> Color:
-        if self.settings['setting_dark_mode']:
-            return self.colors['color_graph_paper_bgnd_dark']
-        else:
-            return self.colors['color_graph_paper_bgnd_light']
-
-    @property
-    def color_graph_paper_lines(self) -> Color:
-        if self.settings['setting_dark_mode']:
-            return self.colors['color_graph_paper_lines_dark']
-        else:
-            return self.colors['color_graph_paper_lines_light']
+    def _rebuild_palette(self) -> None:
+        """Set the color attributes ('self.color_pop', etc.) for the current dark/light mode.
 
-    @property
-    def color_pop(self) -> Color:
-        if self.settings['setting_dark_mode']:
-            return self.colors['color_pop_dark']
-        else:
-            return self.colors['color_pop_light']
-
-    @property
-    def color_hit(self) -> Color:
-        if self.settings['setting_dark_mode']:
-            return self.colors['color_hit_dark']
-        else:
-            return self.colors['color_hit_light']
-
-    @property
-    def color_mouse_dot(self) -> Color:
-        if self.settings['setting_dark_mode']:
-            return self.colors['color_mouse_dot_dark']
-        else:
-            return self.colors['color_mouse_dot_light']
-
-    @property
-    def color_mouse_vector(self) -> Color:
-        if self.settings['setting_dark_mode']:
-            return self.colors['color_mouse_vector_dark']
-        else:
-            return self.colors['color_mouse_vector_light']
-
-    @property
-    def color_1(self) -> Color:
-        if self.settings['setting_dark_mode']:
-            return self.colors['color_1_dark']
-        else:
-            return self.colors['color_1_light']
-
-    @property
-    def color_2(self) -> Color:
-        if self.settings['setting_dark_mode']:
-            return self.colors['color_2_dark']
-        else:
-            return self.colors['color_2_light']
-
-    @property
-    def color_3(self) -> Color:
-        if self.settings['setting_dark_mode']:
-            return self.colors['color_3_dark']
-        else:
-            return self.colors['color_3_light']
+        Call on init and whenever 'setting_dark_mode' changes. Colors are plain
+        attributes (not properties) so the draw code reads them without a
+        function call and a dark mode branch every time.
+        """
+        mode = 'dark' if self.settings['setting_dark_mode'] else 'light'
+        for name in ['color_debug_hud', 'color_graph_paper_bgnd', 'color_graph_paper_lines',
+                     'color_pop', 'color_hit', 'color_mouse_dot', 'color_mouse_vector',
+                     'color_1', 'color_2', 'color_3']:
+            setattr(self, name, self.colors[f'{name}_{mode}'])
+        for player in self.players.values():
+            player.rebuild_palette()
 
 
 if __name__ == '__main__':
@@ -4,9 +4,11 @@
 """
 
 from dataclasses import dataclass
+from typing import NamedTuple
+import numpy as np
 
-@dataclass
-class Line:
+class Line(NamedTuple):
+    """Line from 'start' to 'end'. A NamedTuple: cheap to make, and immutable."""
     start:tuple
     end:tuple
 
@@ -22,3 +24,19 @@ class Line:
         if not self.end: return (None,None)
         return (self.start[0] + self.vector[0]*0.5, self.start[1] + self.vector[1]*0.5)
 
+
+@dataclass
+class GridLines:
+    """Many lines stored as arrays: one array of start points, one of end points.
+
+    start_xy:np.ndarray -- (M,2) array of (x,y) start points
+    end_xy:np.ndarray -- (M,2) array of (x,y) end points
+
+    Row i of 'start_xy' and row i of 'end_xy' make line i. Transform all
+    lines with one array operation instead of one Line at a time.
+    """
+    start_xy:np.ndarray
+    end_xy:np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start_xy)
@@ -6,6 +6,7 @@
 import sys
 import logging
 import os
+from functools import lru_cache
 os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"          # Set pygame env var to hide "Hello" msg
 import pygame
 from pygame import Color
@@ -92,13 +93,11 @@ def scale_data(data:list, a:float=0, b:float=1) -> list:
     substitute a for A, b for B, and c for C:
             (1-λ)a + λb = c
     """
+    # min() and max() each loop in C: faster than one pass in a Python loop
     data_min = min(data)
-    data_max = max(data)
-    scaled_data = []
-    for x in data:
-        scale = (x - data_min)/(data_max - data_min)
-        scaled_data.append((1-scale)*a + scale*b)
-    return scaled_data
+    data_range = max(data) - data_min
+    scales = [(x - data_min)/data_range for x in data]
+    return [(1-scale)*a + scale*b for scale in scales]
 
 class Window:
     """OS window information.
@@ -114,6 +113,19 @@ class Window:
         self.size = (event.x, event.y)
         logger.debug(f"Window resized, self.size: {self.size}")
 
+@lru_cache(maxsize=256)
+def render_text(font:pygame.font.Font, text:str, antialias:bool, color:tuple) -> pygame.Surface:
+    """Return a Surface with text rendered in this font.
+
+    Same as 'font.render(text, antialias, color)', but memoized: HUD lines and
+    labels show the same strings frame after frame. Do not draw on the
+    returned Surface, it is shared.
+
+    color -- (R,G,B,A) (a tuple, because the cache key must be hashable)
+    """
+    ### render(text, antialias, color, background=None) -> Surface
+    return font.render(text, antialias, color)
+
 class Text:
     def __init__(self, pos:tuple, font_size:int, sys_font:str):
         self.pos = pos
@@ -133,11 +145,16 @@ class Text:
 
     def render(self, surf:pygame.Surface, color:Color) -> None:
         """Render text on the surface."""
+        color = tuple(color)
+        linesize = self.font.get_linesize()
+        bottom = surf.get_clip().bottom
         for i, line in enumerate(self.text_lines):
-            ### render(text, antialias, color, background=None) -> Surface
-            text_surf = self.font.render(line, self.antialias, color)
+            y = self.pos[1] + i*linesize
+            # Lines go down the surface: stop at the first line below the visible area
+            if y >= bottom: break
+            text_surf = render_text(self.font, line, self.antialias, color)
             surf.blit(text_surf,
-                      (self.pos[0], self.pos[1] + i*self.font.get_linesize()),
+                      (self.pos[0], y),
                       special_flags=pygame.BLEND_ALPHA_SDL2
                       )
 
@@ -146,6 +163,11 @@ class DebugHud:
         self.game = game
         self.debug_text = ""
         self.is_visible = True
+        # Make the Text once (loading a SysFont is slow), update it every frame
+        self.text = Text((0,0), font_size=15, sys_font="Roboto Mono")
+        # Lines from add_text() pre-rendered on one surface, below FPS and Mouse
+        self._static_surf = None
+        self._static_key = None
 
     def clear_text(self) -> None:
         self.debug_text = ""
@@ -158,12 +180,46 @@ class DebugHud:
         """
         self.debug_text += f"\n{debug_text}"
 
-    def render(self, color:Color = Color(255,255,255)):
-        self.text = Text((0,0), font_size=15, sys_font="Roboto Mono")
+    def _render_static(self, color:tuple) -> pygame.Surface:
+        """Return the added lines of debug text rendered on one surface.
+
+        Games clear and re-add the same lines every frame, so the cache is
+        keyed on the text itself: it is only rebuilt when the text changes.
+        """
+        key = (self.debug_text, color)
+        if key != self._static_key:
+            lines = self.debug_text.split("\n")[1:]
+            linesize = self.text.font.get_linesize()
+            text_surfs = [render_text(self.text.font, line, self.text.antialias, color)
+                          for line in lines]
+            width = max((text_surf.get_width() for text_surf in text_surfs), default=0)
+            self._static_surf = pygame.Surface((width, len(lines)*linesize),
+                                               flags=pygame.SRCALPHA)
+            for i, text_surf in enumerate(text_surfs):
+                self._static_surf.blit(text_surf, (0, i*linesize))
+            self._static_key = key
+        return self._static_surf
+
+    def render(self, color:Color = Color(255,255,255)) -> list:
+        """Render the debug text on the OS window.
+
+        Return the rects drawn on, for pygame.display.update().
+        """
+        color = tuple(color)
+        surf = self.game.surfs['surf_os_window']
         mpos = pygame.mouse.get_pos()
-        self.text.update(f"FPS: {self.game.clock.get_fps():0.1f} | Mouse: {mpos}"
-                         f"{self.debug_text}")
-        self.text.render(self.game.surfs['surf_os_window'], color)
+        # Only the first line changes every frame
+        self.text.update(f"FPS: {self.game.clock.get_fps():0.1f} | Mouse: {mpos}")
+        self.text.render(surf, color)
+        text_surf = render_text(self.text.font, self.text.text_lines[0],
+                                self.text.antialias, color)
+        dirty_rects = [text_surf.get_rect(topleft=self.text.pos)]
+        if self.debug_text:
+            static_pos = (self.text.pos[0],
+                          self.text.pos[1] + self.text.font.get_linesize())
+            dirty_rects.append(surf.blit(self._render_static(color), static_pos,
+                                         special_flags=pygame.BLEND_ALPHA_SDL2))
+        return dirty_rects
 
 def signum(num) -> int:
     """Return sign of num as +1, -1, or 0.
@@ -178,10 +234,11 @@ def signum(num) -> int:
     1
     >>> signum(-0.1)
     -1
+
+    Branchless: bools are ints, so the difference of the two comparisons is
+    the sign.
     """
-    if num > 0: return 1
-    elif num < 0: return -1
-    else: return 0
+    return (num > 0) - (num < 0)
 
 if __name__ == '__main__':
     from pathlib import Path